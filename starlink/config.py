@@ -19,6 +19,8 @@ TLE_DATA_DIR = Path(DATA_DIR).joinpath("TLE")
 LATENCY_DATA_DIR = Path(DATA_DIR).joinpath("latency")
 
 TLE_URL = "https://celestrak.org/NORAD/elements/gp.php?GROUP=starlink&FORMAT=tle"
+# CelesTrak updates the GP data every few hours, a TLE file downloaded more recently than this is reused
+TLE_MAX_AGE_SECONDS = 2 * 60 * 60
 
 INTERVAL_MS = os.getenv("INTERVAL", "10ms")
 DURATION = os.getenv("DURATION", "2m")
@@ -57,6 +57,15 @@ class DataFeatureExtraction:
             "uncertainty_valid",
             "uncertainty",
         ]
+        # Explicit dtypes for reading the CSV files, so that a column type is not inferred from the
+        # first rows only
+        self.status_dtypes = {
+            column: "float64"
+            for column in self.status_columns
+            if column not in ("hardwareVersion", "attitudeEstimationState")
+        }
+        self.location_dtypes = {column: "float64" for column in self.location_columns if column != "uncertainty_valid"}
+        self.obstruction_dtypes = {"Y": "float64", "X": "float64"}
         self.obstruction_map = ObstructionMap()
 
     def get_status_columns(self) -> List[str]:
@@ -125,33 +134,29 @@ class DataFeatureExtraction:
         """
         pixel_to_degrees = 80 / 62  # Conversion factor from pixel to degrees
 
-        elevations = []
-        azimuths = []
-
-        for index, row in merged_df.iterrows():
-            if frame_type == 1:  # FRAME_EARTH
-                observer_x, observer_y = 62, 62  # Assume this is the observer's pixel location
-                dx, dy = row["X"] - observer_x, (123 - row["Y"]) - observer_y
-            elif frame_type == 2:  # FRAME_UT
-                _tilt = row["tiltAngleDeg"]
-                _rotation_az = row["boresightAzimuthDeg"]
-                observer_x, observer_y = 62, 62 - (_tilt / (80 / 62))
-                dx, dy = row["X"] - observer_x, row["Y"] - observer_y
-
-            radius = np.sqrt(dx**2 + dy**2) * pixel_to_degrees
-            azimuth = np.degrees(np.arctan2(dx, dy))
-
-            if frame_type == 1:  # FRAME_EARTH
-                azimuth = (azimuth + 360) % 360
-            elif frame_type == 2:  # FRAME_UT
-                azimuth = (azimuth + _rotation_az + 360) % 360
-            # Normalize the azimuth to ensure it's within 0 to 360 degrees
-            elevation = 90 - radius
-            elevations.append(elevation)
-            azimuths.append(azimuth)
-
-        merged_df["Elevation"] = elevations
-        merged_df["Azimuth"] = azimuths
+        # Computed column-wise for all rows at once
+        x = merged_df["X"].to_numpy(dtype=np.float64)
+        y = merged_df["Y"].to_numpy(dtype=np.float64)
+        if frame_type == 1:  # FRAME_EARTH
+            observer_x, observer_y = 62, 62  # Assume this is the observer's pixel location
+            dx, dy = x - observer_x, (123 - y) - observer_y
+        elif frame_type == 2:  # FRAME_UT
+            _tilt = merged_df["tiltAngleDeg"].to_numpy(dtype=np.float64)
+            _rotation_az = merged_df["boresightAzimuthDeg"].to_numpy(dtype=np.float64)
+            observer_x, observer_y = 62, 62 - (_tilt / (80 / 62))
+            dx, dy = x - observer_x, y - observer_y
+
+        radius = np.sqrt(dx**2 + dy**2) * pixel_to_degrees
+        azimuth = np.degrees(np.arctan2(dx, dy))
+
+        # Normalize the azimuth to ensure it's within 0 to 360 degrees
+        if frame_type == 1:  # FRAME_EARTH
+            azimuth = (azimuth + 360) % 360
+        elif frame_type == 2:  # FRAME_UT
+            azimuth = (azimuth + _rotation_az + 360) % 360
+
+        merged_df["Elevation"] = 90 - radius
+        merged_df["Azimuth"] = azimuth
         return merged_df
 
     def merge_obstruction_with_status_and_location(
@@ -183,7 +188,7 @@ class DataFeatureExtraction:
         """
         try:
             # Read obstruction data
-            df_obstruction = pd.read_csv(filename)
+            df_obstruction = pd.read_csv(filename, engine="pyarrow", dtype=self.obstruction_dtypes)
             df_obstruction["timestamp"] = pd.to_datetime(df_obstruction["timestamp"], format="%Y-%m-%d %H:%M:%S")
             df_obstruction = df_obstruction.set_index("timestamp").resample("1s").min().reset_index()
 
@@ -247,18 +252,31 @@ class DataFeatureExtraction:
             logger.error(f"Error merging data: {str(e)}", exc_info=True)
             return pd.DataFrame()
 
+    def get_observed_data(self, merged_df: pd.DataFrame) -> pd.DataFrame:
+        """Get the observed positions from pre-processed merged data.
+
+        Args:
+            merged_df: Merged DataFrame with Elevation and Azimuth columns, as returned by
+                pre_process_observed_data_by_frame_type
+
+        Returns:
+            pd.DataFrame: DataFrame with Elevation and Azimuth columns and a sorted timestamp (naive UTC)
+                index, to be passed to process_observed_data for every interval
+        """
+        df_observed = merged_df[["timestamp", "Elevation", "Azimuth"]].copy()
+        df_observed["timestamp"] = df_observed["timestamp"].dt.tz_localize(None)
+        return df_observed.set_index("timestamp").sort_index()
+
     def process_observed_data(
         self,
-        filename: str,
+        df_observed: pd.DataFrame,
         timestamp: str,
-        merged_data_file: str,
     ) -> Optional[List[Tuple[datetime, Tuple[float, float]]]]:
         """Process observed positions from obstruction data.
 
         Args:
-            filename: Path to the obstruction data file
+            df_observed: DataFrame with the observed positions, as returned by get_observed_data
             timestamp: ISO format timestamp string
-            merged_data_file: Path to the merged data file
 
         Returns:
             Optional[List[Tuple[datetime, Tuple[float, float]]]]: List of tuples containing:
@@ -269,35 +287,24 @@ class DataFeatureExtraction:
             - Processes data in 15-second intervals
             - Returns None if processing fails
             - Requires valid obstruction map data
+            - Works on the in-memory data, the merged data file is not read for every interval
+            - Finds the interval bounds by binary search on the sorted timestamp index instead of
+              masking every row
         """
         try:
-            # Read obstruction data
-            df_obstruction_merged = pd.read_csv(merged_data_file)
-            # 2025-05-27 07:33:14+00:00
-            df_obstruction_merged["timestamp"] = pd.to_datetime(
-                df_obstruction_merged["timestamp"], format="%Y-%m-%d %H:%M:%S%z"
-            ).dt.tz_localize(None)
-
-            # Get data for the specified timestamp
+            # Get data for the specified timestamp, the end of the interval is exclusive
             timestamp_dt = pd.to_datetime(timestamp).tz_localize(None)
-            timeslot_df = df_obstruction_merged[
-                (df_obstruction_merged["timestamp"] >= timestamp_dt)
-                & (df_obstruction_merged["timestamp"] < timestamp_dt + pd.Timedelta(seconds=15))
-            ]
+            start, end = df_observed.index.searchsorted([timestamp_dt, timestamp_dt + pd.Timedelta(seconds=15)])
+            timeslot_df = df_observed.iloc[start:end]
 
             if timeslot_df.empty:
                 logger.error(f"No data found for timestamp {timestamp}")
                 return None
 
-            # Process the timeslot
-            observed_positions = []
-            for _, row in timeslot_df.iterrows():
-                timestamp_dt = pd.to_datetime(row["timestamp"])
-                elevation = 90 - row["Elevation"]
-                azimuth = row["Azimuth"] % 360
-                observed_positions.append((timestamp_dt, (elevation, azimuth)))
-
-            return observed_positions
+            # Process the timeslot column-wise
+            elevations = (90 - timeslot_df["Elevation"].to_numpy()).tolist()
+            azimuths = (timeslot_df["Azimuth"].to_numpy() % 360).tolist()
+            return list(zip(timeslot_df.index, zip(elevations, azimuths)))
 
         except Exception as e:
             logger.error(f"Error processing observed data: {str(e)}", exc_info=True)
@@ -308,6 +315,8 @@ class DataFeatureExtraction:
         timeslot_df: pd.DataFrame,
         writer: csv.writer,
         csvfile: Any,
+        serving_satellite_writer: csv.writer,
+        serving_satellite_csvfile: Any,
         filename: str,
         dt_string: str,
         date: str,
@@ -330,8 +339,9 @@ class DataFeatureExtraction:
                 logger.error(f"Status file not found: {status_filename}")
                 return
 
-            # Read status data
-            df_status = pd.read_csv(status_filename)
+            # Read status data. The C engine is used because the gRPC job may still be appending to the file,
+            # and unlike the pyarrow engine it accepts a partly written last row
+            df_status = pd.read_csv(status_filename, engine="c", dtype=self.status_dtypes)
 
             # Handle location data based on installation type
             gps_diagnostics_df = None
@@ -340,7 +350,7 @@ class DataFeatureExtraction:
                     logger.error(f"Location file not found: {gps_diagnostics_filename}")
                     return
 
-                gps_diagnostics_df = pd.read_csv(gps_diagnostics_filename)
+                gps_diagnostics_df = pd.read_csv(gps_diagnostics_filename, engine="c", dtype=self.location_dtypes)
                 if not all(col in gps_diagnostics_df.columns for col in ["timestamp", "lat", "lon", "alt"]):
                     logger.error("Missing required columns in location file for mobile installation")
                     return
@@ -358,6 +368,11 @@ class DataFeatureExtraction:
 
             if merged_df is None or merged_df.empty:
                 logger.warning("No satellite data to save")
+                return
+
+            # Append the serving satellites of this timeslot to the file opened by the job
+            serving_satellite_writer.writerows(merged_df.itertuples(index=False, name=None))
+            serving_satellite_csvfile.flush()
 
         except Exception as e:
             logger.error(f"Error in processing thread: {str(e)}", exc_info=True)
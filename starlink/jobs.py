@@ -6,7 +6,7 @@ import threading
 
 from typing import Optional, List, Dict, Any
 from pathlib import Path
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 
 import pandas as pd
 
@@ -204,40 +204,30 @@ class JobManager:
         date = ensure_data_directory(self.grpc_data_dir)
         filename = f"{self.grpc_data_dir}/{date}/obstruction_map-{dt_string}.parquet"
         obstruction_data_filename = f"{DATA_DIR}/obstruction-data-{dt_string}.csv"
+        serving_satellite_filename = f"{DATA_DIR}/serving_satellite_data-{dt_string}.csv"
 
         # Get frame type for obstruction map
         frame_type_int, _ = self.grpc.get_obstruction_map_frame_type()
         start = time.time()
         thread_pool = []
 
-        # Open CSV file for writing obstruction data
-        with open(obstruction_data_filename, "w", newline="") as csvfile:
+        # Open CSV files for writing obstruction data and estimated serving satellites
+        with (
+            open(obstruction_data_filename, "w", newline="") as csvfile,
+            open(serving_satellite_filename, "w", newline="") as serving_satellite_csvfile,
+        ):
             writer = csv.writer(csvfile)
             writer.writerow(["timestamp", "Y", "X"])
+            serving_satellite_writer = csv.writer(serving_satellite_csvfile)
+            serving_satellite_writer.writerow(["Timestamp", "Connected_Satellite", "Distance"])
             last_timeslot_second = None
 
             while time.time() < start + DURATION_SECONDS:
                 try:
                     if last_timeslot_second is None:
-                        now = datetime.now(timezone.utc)
-                        if now.second >= 12 and now.second < 27:
-                            start_time = now.replace(microsecond=0).replace(second=27)
-                            last_timeslot_second = 27
-                        elif now.second >= 27 and now.second < 42:
-                            start_time = now.replace(microsecond=0).replace(second=42)
-                            last_timeslot_second = 42
-                        elif now.second >= 42 and now.second < 57:
-                            start_time = now.replace(microsecond=0).replace(second=57)
-                            last_timeslot_second = 57
-                        elif now.second >= 57 and now.second < 60:
-                            start_time = now.replace(microsecond=0).replace(second=12) + timedelta(minutes=1)
-                            last_timeslot_second = 12
-                        elif now.second >= 0 and now.second < 12:
-                            start_time = now.replace(microsecond=0).replace(second=12)
-                            last_timeslot_second = 12
-
-                        while datetime.now(timezone.utc) < start_time:
-                            time.sleep(0.1)
+                        start_time = TimeslotManager.get_next_timeslot_start(datetime.now(timezone.utc))
+                        last_timeslot_second = start_time.second
+                        TimeslotManager.sleep_until(start_time)
                     else:
                         last_timeslot_second = TimeslotManager.wait_until_target_time(last_timeslot_second)
 
@@ -259,6 +249,8 @@ class JobManager:
                                 timeslot_df,
                                 writer,
                                 csvfile,
+                                serving_satellite_writer,
+                                serving_satellite_csvfile,
                                 filename,
                                 dt_string,
                                 date,
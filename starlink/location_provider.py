@@ -1,5 +1,6 @@
 import logging
-from typing import Optional, Any
+from typing import List, Optional, Any
+from datetime import datetime
 
 import pandas as pd
 from skyfield.api import wgs84
@@ -65,6 +66,69 @@ class LocationProvider:
             logger.error(f"Error getting observer location: {str(e)}", exc_info=True)
             return None
 
+    def prepare_gps_track(self, df_gps_diagnostics: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Prepare GPS diagnostics data for nearest-neighbour location lookups.
+
+        Args:
+            df_gps_diagnostics: DataFrame containing GPS diagnostics data with
+                timestamp, lat, lon and alt columns.
+
+        Returns:
+            Optional[pd.DataFrame]: The timestamp, lat, lon and alt columns with UTC
+                timestamps, sorted by timestamp and without incomplete fixes, or None
+                if the data is missing or invalid.
+
+        Note:
+            - The result is meant to be prepared once and shared by every call to
+              get_observer_locations_at_times
+        """
+        try:
+            if df_gps_diagnostics is None or df_gps_diagnostics.empty:
+                logger.error("GPS diagnostics data is required for mobile installations")
+                return None
+
+            df_gps = df_gps_diagnostics[["timestamp", "lat", "lon", "alt"]].copy()
+            unit = "s" if pd.api.types.is_numeric_dtype(df_gps["timestamp"]) else None
+            df_gps["timestamp"] = pd.to_datetime(df_gps["timestamp"], unit=unit, utc=True)
+            return df_gps.dropna(subset=["lat", "lon", "alt"]).sort_values("timestamp")
+
+        except Exception as e:
+            logger.error(f"Error preparing GPS data: {str(e)}", exc_info=True)
+            return None
+
+    def get_observer_locations_at_times(
+        self, df_gps_track: pd.DataFrame, timestamps: List[datetime]
+    ) -> Optional[List[Any]]:
+        """Get the observer locations for several timestamps at once.
+
+        Args:
+            df_gps_track: GPS data prepared by prepare_gps_track
+            timestamps: List of timestamps to resolve, naive timestamps are treated as UTC
+
+        Returns:
+            Optional[List[Any]]: Location objects in the same order as timestamps, each
+                taken from the closest GPS sample, or None if they cannot be determined.
+
+        Note:
+            - All timestamps are resolved with a single nearest-neighbour merge_asof
+        """
+        try:
+            if df_gps_track is None or df_gps_track.empty:
+                logger.error("GPS diagnostics data is required for mobile installations")
+                return None
+
+            df_times = pd.DataFrame({"timestamp": pd.to_datetime(pd.Series(timestamps), utc=True)})
+            df_times["order"] = range(len(df_times))
+            df_matched = pd.merge_asof(
+                df_times.sort_values("timestamp"), df_gps_track, on="timestamp", direction="nearest"
+            ).sort_values("order")
+
+            return [wgs84.latlon(row.lat, row.lon, row.alt) for row in df_matched.itertuples()]
+
+        except Exception as e:
+            logger.error(f"Error getting observer locations: {str(e)}", exc_info=True)
+            return None
+
     def get_mobile_location_at_time(self, df_location: pd.DataFrame, timestamp: float) -> Optional[Any]:
         """Get location data for a specific timestamp."""
         try:
@@ -572,8 +572,7 @@ def get_connected_satellite_lat_lon(
     timestamp_dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S%z")
 
     all_satellites_in_canvas = []
-    timescale = load.timescale(builtin=True)
-    time_ts = timescale.utc(
+    time_ts = ts.utc(
         timestamp_dt.year,
         timestamp_dt.month,
         timestamp_dt.day,
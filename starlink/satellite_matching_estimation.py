@@ -1,20 +1,30 @@
-import os
 import logging
 
-from typing import List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
 
 import pandas as pd
 import numpy as np
+from sgp4.api import SatrecArray, jday
 from skyfield.api import load
+from skyfield.sgp4lib import theta_GMST1982
 
 import config
 from location_provider import LocationProvider
+from timeslot_manager import TimeslotManager
 from data_feature_extraction import DataFeatureExtraction
 
 logger = logging.getLogger(__name__)
 
+# Shared timescale, loading it is expensive and it never changes during a run
+_TS = load.timescale(builtin=True)
+
+# Base data directories, fixed for the whole run
+_DATA_DIR = Path(config.DATA_DIR)
+_TLE_DATA_DIR = Path(config.TLE_DATA_DIR)
+
 
 class SatelliteProcessor:
     """Handles satellite estimation, matching, and distance calculations.
@@ -29,6 +39,12 @@ class SatelliteProcessor:
         location_provider (LocationProvider): For obtaining observer location data
     """
 
+    MIN_ELEVATION = 20  # Minimum elevation in degrees for a satellite to be considered
+    PREFILTER_SEPARATION = 30  # Maximum angular separation in degrees from the middle observation
+    COARSE_PREFILTER_SECONDS = 60  # Length of the time window sharing one coarse prefilter
+    COARSE_ELEVATION_MARGIN = 5  # Elevation margin in degrees of the coarse prefilter
+    MAX_SATELLITE_SPEED = 8.0  # Upper bound in km/s of the speed of a satellite in low earth orbit
+
     def __init__(self):
         """Initialize the SatelliteProcessor with required components."""
         self.data_extracter = DataFeatureExtraction()
@@ -57,38 +73,36 @@ class SatelliteProcessor:
             - For mobile installations, requires location data
             - Processes data in 15-second intervals
             - Requires TLE data for satellite positions
+            - Does not write the results, the caller is responsible for saving them
         """
         try:
             # Convert timestamps to datetime
             start_ts = datetime.fromtimestamp(start_time, tz=timezone.utc)
             end_ts = datetime.fromtimestamp(end_time, tz=timezone.utc)
 
-            # Get location data file for mobile installations
+            # Input and output files of this session
+            filename = _DATA_DIR / f"obstruction-data-{uuid}.csv"
+            merged_data_file = _DATA_DIR / f"processed_obstruction-data-{uuid}.csv"
+            tle_file = _TLE_DATA_DIR / date / f"starlink-tle-{uuid}.txt"
+            location_filename = _DATA_DIR / "grpc" / date / f"GRPC_LOCATION-{uuid}.csv"
+
+            # Check the input files of the merge before doing any work
+            required_files = [filename] + ([location_filename] if config.MOBILE else [])
+            if not self.require_files(*required_files):
+                return None
+
+            # Get location data for mobile installations
             df_location = None
             if config.MOBILE:
-                location_filename = f"{config.DATA_DIR}/grpc/{date}/GRPC_LOCATION-{uuid}.csv"
-                if not os.path.exists(location_filename):
-                    logger.error(f"Location file not found: {location_filename}")
-                    return None
-
                 logger.info(f"Reading location file: {location_filename}")
-                df_location = pd.read_csv(location_filename)
+                # Read with the C engine, the gRPC job may still be appending to the file
+                df_location = pd.read_csv(location_filename, engine="c", dtype=self.data_extracter.location_dtypes)
                 df_location["timestamp"] = pd.to_datetime(df_location["timestamp"], unit="s", utc=True)
 
-            # Get obstruction data file
-            obstruction_file = f"obstruction-data-{uuid}.csv"
-            if not os.path.exists(os.path.join(config.DATA_DIR, obstruction_file)):
-                logger.error(f"Obstruction file not found: {obstruction_file}")
-                return None
-
-            # Process obstruction data
-            filename = os.path.join(config.DATA_DIR, obstruction_file)
-            merged_data_file = os.path.join(config.DATA_DIR, f"processed_obstruction-data-{uuid}.csv")
-
             # Merge obstruction data with status and location data
             logger.info("Merging obstruction data with status and location data")
             merged_df = self.data_extracter.merge_obstruction_with_status_and_location(
-                filename, frame_type, df_status, df_location if config.MOBILE else None
+                str(filename), frame_type, df_status, df_location if config.MOBILE else None
             )
             if merged_df.empty:
                 logger.error("Failed to merge data")
@@ -102,31 +116,23 @@ class SatelliteProcessor:
             logger.info(f"Saving merged data to {merged_data_file}")
             merged_df.to_csv(merged_data_file, index=False)
 
-            # Load TLE data
-            tle_file = f"{config.TLE_DATA_DIR}/{date}/starlink-tle-{uuid}.txt"
-            if not os.path.exists(tle_file):
-                logger.error(f"TLE file not found: {tle_file}")
+            # The merged data is saved even without TLE data, only the satellite estimation needs it
+            if not self.require_files(tle_file):
                 return None
 
-            satellites = load.tle_file(tle_file)
+            # Keep the observed positions in memory for the per-interval lookups
+            df_observed = self.data_extracter.get_observed_data(merged_df)
+
+            # Load TLE data
+            satellites = load.tle_file(str(tle_file))
+            satellite_elements = self.build_satellite_elements(satellites)
 
             # Process data in intervals
             result_df = self.process_intervals(
-                filename,
-                start_ts.year,
-                start_ts.month,
-                start_ts.day,
-                start_ts.hour,
-                start_ts.minute,
-                start_ts.second,
-                end_ts.year,
-                end_ts.month,
-                end_ts.day,
-                end_ts.hour,
-                end_ts.minute,
-                end_ts.second,
-                merged_data_file,
-                satellites,
+                start_ts.replace(microsecond=0),
+                end_ts.replace(microsecond=0),
+                df_observed,
+                satellite_elements,
                 frame_type,
                 df_location if config.MOBILE else None,
             )
@@ -135,15 +141,6 @@ class SatelliteProcessor:
                 logger.error("No results returned from process_intervals")
                 return None
 
-            # Save the serving satellite data using the same UUID timestamp
-            serving_satellite_file = f"{config.DATA_DIR}/serving_satellite_data-{uuid}.csv"
-            os.makedirs(os.path.dirname(serving_satellite_file), exist_ok=True)
-
-            # Check if file exists to determine if we need to write header
-            file_exists = os.path.exists(serving_satellite_file)
-
-            # Append to the file
-            result_df.to_csv(serving_satellite_file, mode="a", header=not file_exists, index=False)
             logger.info(f"Satellite estimation complete for {start_ts} to {end_ts}")
 
             return result_df
@@ -152,186 +149,532 @@ class SatelliteProcessor:
             logger.error(f"Error estimating connected satellites: {str(e)}", exc_info=True)
             return None
 
+    def require_files(self, *paths: Path) -> bool:
+        """Check that all required files exist.
+
+        Args:
+            *paths: Paths of the required files
+
+        Returns:
+            bool: True if all files exist, False as soon as one of them is missing
+        """
+        for path in paths:
+            if not path.is_file():
+                logger.error(f"Required file not found: {path}")
+                return False
+        return True
+
+    def build_satellite_elements(self, satellites: List[Any]) -> Dict[str, Any]:
+        """Convert the satellites loaded from TLE data to parallel arrays.
+
+        Args:
+            satellites: List of satellite objects from TLE data
+
+        Returns:
+            Dict[str, Any]: Arrays indexed by satellite position:
+                - name: Satellite names
+                - model: Satrec models
+                - array: SatrecArray of all models for batched propagation
+                - apogee_radius: Geocentric radius in kilometers of the apogee of each satellite
+
+        Note:
+            Hot paths work with integer indices into these arrays, the satellite objects are not kept
+        """
+        models = [satellite.model for satellite in satellites]
+        satellite_elements = {
+            "name": np.array([satellite.name for satellite in satellites], dtype=object),
+            "model": np.array(models, dtype=object),
+            "array": SatrecArray(models),
+        }
+        satellite_elements["apogee_radius"] = np.array(
+            [(1.0 + model.alta) * model.radiusearthkm for model in models], dtype=np.float64
+        )
+        return satellite_elements
+
     def find_matching_satellites(
         self,
-        satellites: List[Any],
+        satellite_elements: Dict[str, Any],
         observer_location: Any,
         observed_positions_with_timestamps: List[Tuple[datetime, Tuple[float, float]]],
         frame_type: int,
-    ) -> List[str]:
+        observer_locations: Optional[List[Any]] = None,
+        start_time: Optional[datetime] = None,
+        interval_seconds: int = TimeslotManager.TIMESLOT_DURATION,
+        observer_frame: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        time_grid: Optional[Dict[str, Any]] = None,
+        satellite_indices: Optional[np.ndarray] = None,
+    ) -> Tuple[List[str], Optional[np.ndarray], Optional[int]]:
         """Find matching satellites based on observed positions.
 
         Args:
-            satellites: List of satellite objects from TLE data
+            satellite_elements: Satellite arrays from build_satellite_elements
             observer_location: Location object for the observer
             observed_positions_with_timestamps: List of (timestamp, (altitude, azimuth)) tuples
             frame_type: Reference frame type (1=FRAME_EARTH, 2=FRAME_UT)
+            observer_locations: Optional location object for each observed timestamp, used for
+                mobile installations instead of observer_location
+            start_time: Optional start time (UTC) of the interval to calculate distances for
+            interval_seconds: Number of seconds to calculate distances for
+            observer_frame: Optional precomputed observer frame of observer_location, from get_observer_frame
+            time_grid: Optional precomputed propagation times, from build_time_grid
+            satellite_indices: Optional indices of the satellites to consider, from build_coarse_candidates,
+                all satellites are considered if not given
 
         Returns:
-            List[str]: List containing the name of the best matching satellite
+            Tuple containing:
+                - List containing the name of the best matching satellite
+                - Distances in kilometers to the best match for each second from start_time,
+                  or None if start_time is not given or observer_locations is used
+                - Index of the best matching satellite in satellite_elements, or None without a match
 
         Note:
-            - Compares three observed positions to all satellites
+            - Prefilters satellites by their position at the middle observation
+            - Compares observed positions to the remaining candidate satellites
             - Only considers satellites above 20 degrees elevation
             - Uses different distance calculations based on frame type
+            - For a fixed observer, the observed timestamps and the distance seconds are
+              propagated in a single call
         """
-        best_match = None
-        closest_total_difference = float("inf")
-        ts = load.timescale()
-
-        for satellite in satellites:
-            satellite_positions = []
-            valid_positions = True
-
-            for observed_time, observed_data in observed_positions_with_timestamps:
-                difference = satellite - observer_location
-                topocentric = difference.at(
-                    ts.utc(
-                        observed_time.year,
-                        observed_time.month,
-                        observed_time.day,
-                        observed_time.hour,
-                        observed_time.minute,
-                        observed_time.second,
-                    )
-                )
-                alt, az, _ = topocentric.altaz()
+        if observer_locations is None and observer_frame is None:
+            observer_frame = self.get_observer_frame([observer_location])
+
+        # One set of propagation times covering the observed timestamps and, for a fixed observer, every
+        # second of the interval, shared by every satellite
+        reference_time = (start_time or observed_positions_with_timestamps[0][0]).replace(tzinfo=None)
+        observed_offsets = np.array(
+            [
+                (observed_time - reference_time).total_seconds()
+                for observed_time, _ in observed_positions_with_timestamps
+            ]
+        )
+        if start_time is not None and observer_locations is None:
+            distance_offsets = np.arange(interval_seconds + 1)
+        else:
+            distance_offsets = np.empty(0)
+        offsets = np.unique(np.concatenate([observed_offsets, distance_offsets]))
+        observed_index = np.searchsorted(offsets, observed_offsets)
+        distance_index = np.searchsorted(offsets, distance_offsets)
+
+        # UTC Julian dates for SGP4 and GMST1982 angles for the TEME to ITRS rotation
+        jd, fr, theta = self.calculate_propagation_times(reference_time, offsets, time_grid)
+
+        # Cheap prefilter: only the middle observation is evaluated for every satellite, and only
+        # satellites near the observed position at that time go through the full trajectory scoring
+        middle = len(observed_positions_with_timestamps) // 2
+        _, middle_data = observed_positions_with_timestamps[middle]
+        middle_alt = 90 - middle_data[0]
+        middle_az = middle_data[1]
+        m = observed_index[middle]
+        if observer_locations is not None:
+            middle_frame = self.get_observer_frame([observer_locations[middle]])
+        else:
+            middle_frame = observer_frame
+        if satellite_indices is None:
+            satellite_indices = np.arange(len(satellite_elements["name"]))
+            prefilter_array = satellite_elements["array"]
+        else:
+            prefilter_array = SatrecArray(list(satellite_elements["model"][satellite_indices]))
+        middle_alts, middle_azs, _ = self.calculate_topocentric_positions(
+            prefilter_array, jd[[m]], fr[[m]], theta[[m]], middle_frame, dtype=np.float32
+        )
+
+        # The angular separation does not blow up near the zenith like the azimuth offset does, where one pixel
+        # of obstruction map noise can move the observed azimuth by tens of degrees
+        separation = self.angular_separation(middle_alt, middle_az, middle_alts[:, 0], middle_azs[:, 0])
+        kept = np.flatnonzero((middle_alts[:, 0] > self.MIN_ELEVATION) & (separation <= self.PREFILTER_SEPARATION))
+        logger.debug(
+            f"Prefilter kept {len(kept)} of {len(satellite_indices)} satellites around "
+            f"alt={middle_alt:.1f}, az={middle_az:.1f}"
+        )
+        if len(kept) == 0:
+            return [], None, None
+
+        candidates = satellite_indices[kept]
+
+        # Propagate every candidate at every time in a single SGP4 call
+        candidate_array = SatrecArray(list(satellite_elements["model"][candidates]))
+        if observer_locations is None:
+            alts, azs, distances = self.calculate_topocentric_positions(candidate_array, jd, fr, theta, observer_frame)
+            alts, azs = alts[:, observed_index], azs[:, observed_index]
+            distances = distances[:, distance_index]
+        else:
+            alts, azs, _ = self.calculate_topocentric_positions(
+                candidate_array,
+                jd[observed_index],
+                fr[observed_index],
+                theta[observed_index],
+                self.get_observer_frame(observer_locations),
+            )
+            distances = None
+
+        # Observed (altitude, azimuth) positions, built once and shared by every candidate
+        observed_positions = np.empty((len(observed_positions_with_timestamps), 2))
+        for i, (_, observed_data) in enumerate(observed_positions_with_timestamps):
+            observed_positions[i, 0] = 90.0 - observed_data[0]
+            observed_positions[i, 1] = observed_data[1]
+
+        # Only candidates above the minimum elevation at every observed time are scored
+        visible = np.flatnonzero(np.all(alts > self.MIN_ELEVATION, axis=1))
+
+        if len(visible) == 0:
+            return [], None, None
+
+        # Score every visible candidate in one vectorized pass
+        satellite_positions = np.stack((alts[visible], azs[visible]), axis=-1)
+        if frame_type == 1:  # FRAME_EARTH
+            total_differences = self.calculate_total_difference(observed_positions, satellite_positions)
+        elif frame_type == 2:  # FRAME_UT
+            total_differences = self.calculate_trajectory_distance_frame_ut(observed_positions, satellite_positions)
+
+        k = visible[np.argmin(total_differences)]
+        best_match_index = candidates[k]
+        best_match_distances = distances[k] if distances is not None else None
+
+        return [satellite_elements["name"][best_match_index]], best_match_distances, best_match_index
+
+    def build_coarse_candidates(
+        self,
+        satellite_elements: Dict[str, Any],
+        start_time: datetime,
+        window_count: int,
+        observer_frame: Tuple[np.ndarray, np.ndarray],
+        time_grid: Optional[Dict[str, Any]] = None,
+    ) -> List[np.ndarray]:
+        """Find the satellites that can be visible during each coarse prefilter window.
+
+        Args:
+            satellite_elements: Satellite arrays from build_satellite_elements
+            start_time: Start time of the first window (UTC)
+            window_count: Number of consecutive windows of COARSE_PREFILTER_SECONDS
+            observer_frame: Observer frame of a fixed observer, from get_observer_frame
+            time_grid: Optional precomputed propagation times, from build_time_grid
+
+        Returns:
+            List[np.ndarray]: Indices of the satellites to consider for each window
 
-                if alt.degrees <= 20:
-                    valid_positions = False
-                    break
+        Note:
+            - Every satellite is propagated once at the middle of each window
+            - A satellite is kept when it is close enough to be above MIN_ELEVATION minus
+              COARSE_ELEVATION_MARGIN at its apogee radius, after moving at MAX_SATELLITE_SPEED
+              for half a window
+        """
+        half_window = self.COARSE_PREFILTER_SECONDS / 2
+        offsets = self.COARSE_PREFILTER_SECONDS * np.arange(window_count, dtype=np.float64) + half_window
+        jd, fr, theta = self.calculate_propagation_times(start_time, offsets, time_grid)
+        _, _, distances = self.calculate_topocentric_positions(
+            satellite_elements["array"], jd, fr, theta, observer_frame, dtype=np.float32
+        )
+
+        # Slant range from the observer to the apogee radius at the coarse minimum elevation
+        observer_radius = np.linalg.norm(observer_frame[0][0])
+        elevation = np.radians(self.MIN_ELEVATION - self.COARSE_ELEVATION_MARGIN)
+        max_range = (
+            np.sqrt(satellite_elements["apogee_radius"] ** 2 - (observer_radius * np.cos(elevation)) ** 2)
+            - observer_radius * np.sin(elevation)
+            + self.MAX_SATELLITE_SPEED * half_window
+        )
+        return [np.flatnonzero(distances[:, window] <= max_range) for window in range(window_count)]
+
+    def build_time_grid(self, start_time: datetime, seconds: int) -> Dict[str, Any]:
+        """Precompute the propagation times for every second of a processing range.
+
+        Args:
+            start_time: Start time of the range (UTC)
+            seconds: Number of seconds in the range
+
+        Returns:
+            Dict[str, Any]: start_time of the grid, together with the jd, fr and theta arrays
+                from calculate_propagation_times for every second from start_time
+        """
+        start_time = start_time.replace(tzinfo=None)
+        jd, fr, theta = self.calculate_propagation_times(start_time, np.arange(seconds, dtype=np.float64))
+        return {"start_time": start_time, "jd": jd, "fr": fr, "theta": theta}
+
+    def calculate_propagation_times(
+        self, reference_time: datetime, offsets: np.ndarray, time_grid: Optional[Dict[str, Any]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Calculate the SGP4 Julian dates and GMST1982 angles of times relative to a reference time.
+
+        Args:
+            reference_time: Reference time (UTC)
+            offsets: Offsets in seconds from reference_time
+            time_grid: Optional precomputed propagation times, from build_time_grid
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Whole and fractional UTC Julian dates and
+                GMST1982 angles in radians of each time
+
+        Note:
+            Whole seconds covered by time_grid are looked up instead of being calculated again
+        """
+        reference_time = reference_time.replace(tzinfo=None)
+        if time_grid is not None:
+            grid_offsets = offsets + (reference_time - time_grid["start_time"]).total_seconds()
+            grid_index = grid_offsets.astype(np.int64)
+            if (
+                len(grid_index)
+                and np.all(grid_index == grid_offsets)
+                and grid_index.min() >= 0
+                and grid_index.max() < len(time_grid["jd"])
+            ):
+                return time_grid["jd"][grid_index], time_grid["fr"][grid_index], time_grid["theta"][grid_index]
+
+        jd, fr = jday(
+            reference_time.year,
+            reference_time.month,
+            reference_time.day,
+            reference_time.hour,
+            reference_time.minute,
+            reference_time.second,
+        )
+        jd = np.full(len(offsets), jd)
+        fr = fr + offsets / 86400.0
+        times = _TS.utc(
+            reference_time.year,
+            reference_time.month,
+            reference_time.day,
+            reference_time.hour,
+            reference_time.minute,
+            reference_time.second + offsets,
+        )
+        theta, _ = theta_GMST1982(times.whole, times.ut1_fraction)
+        return jd, fr, theta
+
+    def get_observer_frame(self, observer_locations: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Precompute the ITRS position and local frame of observer locations.
+
+        Args:
+            observer_locations: Location objects for the observer
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: ITRS positions in kilometers with shape (locations, 3) and
+                rotation matrices from ITRS to the local east, north, up frame with shape (locations, 3, 3)
 
-                satellite_positions.append((alt.degrees, az.degrees))
+        Note:
+            For a fixed observer this only needs to be done once per run
+        """
+        observer_xyz = np.array([location.itrs_xyz.km for location in observer_locations])
+        latitude = np.array([location.latitude.radians for location in observer_locations])
+        longitude = np.array([location.longitude.radians for location in observer_locations])
+        sin_lat, cos_lat = np.sin(latitude), np.cos(latitude)
+        sin_lon, cos_lon = np.sin(longitude), np.cos(longitude)
+        enu_rotation = np.stack(
+            [
+                np.stack([-sin_lon, cos_lon, np.zeros_like(sin_lon)], axis=-1),
+                np.stack([-sin_lat * cos_lon, -sin_lat * sin_lon, cos_lat], axis=-1),
+                np.stack([cos_lat * cos_lon, cos_lat * sin_lon, sin_lat], axis=-1),
+            ],
+            axis=1,
+        )
+        return observer_xyz, enu_rotation
 
-            if valid_positions:
-                if frame_type == 1:  # FRAME_EARTH
-                    total_difference = self.calculate_total_difference(
-                        [(90 - data[0], data[1]) for _, data in observed_positions_with_timestamps], satellite_positions
-                    )
-                elif frame_type == 2:  # FRAME_UT
-                    total_difference = self.calculate_trajectory_distance_frame_ut(
-                        [(90 - data[0], data[1]) for _, data in observed_positions_with_timestamps], satellite_positions
-                    )
+    def calculate_topocentric_positions(
+        self,
+        satellite_array: SatrecArray,
+        jd: np.ndarray,
+        fr: np.ndarray,
+        theta: np.ndarray,
+        observer_frame: Tuple[np.ndarray, np.ndarray],
+        dtype: Any = np.float64,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Propagate satellites with SGP4 and convert them to topocentric coordinates.
 
-                if total_difference < closest_total_difference:
-                    closest_total_difference = total_difference
-                    best_match = satellite.name
+        Args:
+            satellite_array: SatrecArray of the satellites to propagate
+            jd, fr: Whole and fractional UTC Julian dates of each time
+            theta: GMST1982 angle in radians of each time
+            observer_frame: Observer frame from get_observer_frame, with one location for each time or a
+                single one for all times
+            dtype: Floating point type of the topocentric coordinates, float32 is accurate to well
+                below a meter and enough for the prefilters
 
-        return [best_match] if best_match else []
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Altitude and azimuth in degrees and distance in
+                kilometers, each with shape (satellites, times)
+
+        Note:
+            - Positions that SGP4 fails to propagate are NaN
+            - TEME to ITRS is a rotation by the GMST1982 angle, without polar motion, which is how
+              Skyfield relates the two frames
+            - The offset from the observer is taken in float64 before converting to dtype, so that
+              the cancellation of the two Earth-sized vectors does not lose precision
+        """
+        errors, r_teme, _ = satellite_array.sgp4(jd, fr)
+        r_teme[errors != 0] = np.nan
+
+        # TEME to ITRS, then the offset from the observer
+        observer_xyz, enu_rotation = observer_frame
+        cos_theta, sin_theta = np.cos(theta), np.sin(theta)
+        offset = np.empty_like(r_teme)
+        offset[..., 0] = cos_theta * r_teme[..., 0] + sin_theta * r_teme[..., 1]
+        offset[..., 1] = cos_theta * r_teme[..., 1] - sin_theta * r_teme[..., 0]
+        offset[..., 2] = r_teme[..., 2]
+        offset -= observer_xyz
+        offset = offset.astype(dtype, copy=False)
+        enu_rotation = enu_rotation.astype(dtype, copy=False)
+
+        # Rotate the ITRS offset into the local east, north, up frame of the observer
+        enu = np.einsum("tij,stj->sti", np.broadcast_to(enu_rotation, (len(jd), 3, 3)), offset)
+        east, north, up = enu[..., 0], enu[..., 1], enu[..., 2]
+
+        alt = np.degrees(np.arctan2(up, np.hypot(east, north)))
+        az = np.degrees(np.arctan2(east, north)) % 360
+        distance = np.sqrt(np.einsum("sti,sti->st", offset, offset))
+        return alt, az, distance
 
     def calculate_distance_for_best_match(
-        self, satellite: Any, observer_location: Any, start_time: datetime, interval_seconds: int
-    ) -> List[float]:
+        self,
+        satellite_model: Any,
+        observer_location: Any,
+        start_time: datetime,
+        interval_seconds: int,
+        time_grid: Optional[Dict[str, Any]] = None,
+        observer_locations: Optional[List[Any]] = None,
+    ) -> np.ndarray:
         """Calculate distances for the best matching satellite.
 
         Args:
-            satellite: Satellite object from TLE data
+            satellite_model: Satrec model of the satellite
             observer_location: Location object for the observer
             start_time: Start time for distance calculations
             interval_seconds: Number of seconds to calculate distances for
+            time_grid: Optional precomputed propagation times, from build_time_grid
+            observer_locations: Optional location object for each second, used for mobile
+                installations instead of observer_location
 
         Returns:
-            List[float]: List of distances in kilometers for each second
+            np.ndarray: Distances in kilometers for each second
         """
-        distances = []
-        ts = load.timescale()
-
-        for second in range(interval_seconds + 1):
-            current_time = start_time + timedelta(seconds=second)
-            difference = satellite - observer_location
-            topocentric = difference.at(ts.from_datetime(current_time))
-            distances.append(topocentric.distance().km)
-        return distances
+        # Evaluate every second of the interval in a single vectorized call
+        jd, fr, theta = self.calculate_propagation_times(
+            start_time, np.arange(interval_seconds + 1, dtype=np.float64), time_grid
+        )
+        observer_frame = self.get_observer_frame(observer_locations or [observer_location])
+        _, _, distances = self.calculate_topocentric_positions(
+            SatrecArray([satellite_model]), jd, fr, theta, observer_frame
+        )
+        return distances[0]
 
     def process_feature_time_interval(
         self,
-        filename: str,
-        year: int,
-        month: int,
-        day: int,
-        hour: int,
-        minute: int,
-        second: int,
-        merged_data_file: str,
-        satellites: List[Any],
+        initial_time: datetime,
+        df_observed: pd.DataFrame,
+        satellite_elements: Dict[str, Any],
         frame_type: int,
         df_gps_diagnostics: Optional[pd.DataFrame] = None,
-    ) -> Tuple[Optional[List[Tuple[datetime, Tuple[float, float]]]], Optional[List[str]], Optional[List[float]]]:
+        observer_frame: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        time_grid: Optional[Dict[str, Any]] = None,
+        satellite_indices: Optional[np.ndarray] = None,
+        observer_location: Optional[Any] = None,
+        df_gps_track: Optional[pd.DataFrame] = None,
+    ) -> Tuple[Optional[List[Tuple[datetime, Tuple[float, float]]]], Optional[List[str]], Optional[np.ndarray]]:
         """Process a single time interval for satellite matching.
 
         Args:
-            filename: Path to obstruction data file
-            year, month, day, hour, minute, second: Time components
-            merged_data_file: Path to merged data file
-            satellites: List of satellite objects from TLE data
+            initial_time: Start time of the interval (UTC)
+            df_observed: DataFrame with the observed positions, from DataFeatureExtraction.get_observed_data
+            satellite_elements: Satellite arrays from build_satellite_elements
             frame_type: Reference frame type (1=FRAME_EARTH, 2=FRAME_UT)
             df_gps_diagnostics: Optional DataFrame with GPS data for mobile installations
+            observer_frame: Optional precomputed observer frame for static installations, from get_observer_frame
+            time_grid: Optional precomputed propagation times covering the interval, from build_time_grid
+            satellite_indices: Optional indices of the satellites to consider, from build_coarse_candidates
+            observer_location: Optional precomputed observer location, from LocationProvider.get_observer_location
+            df_gps_track: Optional GPS data for mobile installations, from LocationProvider.prepare_gps_track,
+                prepared from df_gps_diagnostics if not given
 
         Returns:
             Tuple containing:
                 - List of observed positions with timestamps
                 - List of matching satellite names
-                - List of distances to the satellite
+                - Array of distances to the satellite
 
         Note:
             Returns (None, None, None) if processing fails
         """
-        initial_time = datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
+        logger.info(f"Estimating connected satellites for timeslot {initial_time}")
 
         # Get observer location based on installation type
-        observer_location = self.location_provider.get_observer_location(df_gps_diagnostics)
+        if observer_location is None:
+            observer_location = self.location_provider.get_observer_location(df_gps_diagnostics)
         if observer_location is None:
             logger.error("Failed to get observer location")
             return None, None, None
 
         # Get observed positions using the existing method
         observed_positions_with_timestamps = self.data_extracter.process_observed_data(
-            filename, initial_time.strftime("%Y-%m-%dT%H:%M:%SZ"), merged_data_file
+            df_observed, initial_time.strftime("%Y-%m-%dT%H:%M:%SZ")
         )
         if observed_positions_with_timestamps is None:
             return None, None, None
 
-        # Find matching satellites
-        matching_satellites = self.find_matching_satellites(
-            satellites, observer_location, observed_positions_with_timestamps, frame_type
+        # For mobile installations, resolve the observer location of every observed timestamp and of every
+        # distance second in a single lookup, so that the distances are taken from where the dish was
+        observer_locations = None
+        distance_observer_locations = None
+        if config.MOBILE:
+            if df_gps_track is None:
+                df_gps_track = self.location_provider.prepare_gps_track(df_gps_diagnostics)
+            observed_times = [observed_time for observed_time, _ in observed_positions_with_timestamps]
+            distance_start = initial_time.replace(tzinfo=None)
+            distance_times = [
+                distance_start + timedelta(seconds=i) for i in range(TimeslotManager.TIMESLOT_DURATION + 1)
+            ]
+            locations = self.location_provider.get_observer_locations_at_times(
+                df_gps_track, observed_times + distance_times
+            )
+            if locations is None:
+                logger.error("Failed to get observer locations")
+                return None, None, None
+            observed_count = len(observed_times)
+            observer_locations = locations[:observed_count]
+            distance_observer_locations = locations[observed_count:]
+
+        # Find matching satellites, together with the distances to the best match for a fixed observer
+        matching_satellites, distances, best_match_index = self.find_matching_satellites(
+            satellite_elements,
+            observer_location,
+            observed_positions_with_timestamps,
+            frame_type,
+            observer_locations=observer_locations,
+            start_time=initial_time,
+            interval_seconds=TimeslotManager.TIMESLOT_DURATION,
+            observer_frame=observer_frame,
+            time_grid=time_grid,
+            satellite_indices=satellite_indices,
         )
         if not matching_satellites:
             return observed_positions_with_timestamps, None, None
 
-        # Calculate distances for the best match
-        best_match_satellite = next(sat for sat in satellites if sat.name == matching_satellites[0])
-        distances = self.calculate_distance_for_best_match(best_match_satellite, observer_location, initial_time, 14)
+        # Calculate distances for the best match when they were not computed during matching
+        if distances is None:
+            distances = self.calculate_distance_for_best_match(
+                satellite_elements["model"][best_match_index],
+                observer_location,
+                initial_time,
+                interval_seconds=TimeslotManager.TIMESLOT_DURATION,
+                time_grid=time_grid,
+                observer_locations=distance_observer_locations,
+            )
 
         return observed_positions_with_timestamps, matching_satellites, distances
 
     def process_intervals(
         self,
-        filename: str,
-        start_year: int,
-        start_month: int,
-        start_day: int,
-        start_hour: int,
-        start_minute: int,
-        start_second: int,
-        end_year: int,
-        end_month: int,
-        end_day: int,
-        end_hour: int,
-        end_minute: int,
-        end_second: int,
-        merged_data_file: str,
-        satellites: List[Any],
+        start_time: datetime,
+        end_time: datetime,
+        df_observed: pd.DataFrame,
+        satellite_elements: Dict[str, Any],
         frame_type: int,
         df_gps_diagnostics: Optional[pd.DataFrame] = None,
     ) -> Optional[pd.DataFrame]:
         """Process data in intervals and find matching satellites.
 
         Args:
-            filename: Path to obstruction data file
-            start_year, start_month, start_day, start_hour, start_minute, start_second: Start time components
-            end_year, end_month, end_day, end_hour, end_minute, end_second: End time components
-            merged_data_file: Path to merged data file
-            satellites: List of satellite objects from TLE data
+            start_time: Start time of the first interval (UTC)
+            end_time: End time of the processing range (UTC)
+            df_observed: DataFrame with the observed positions, from DataFeatureExtraction.get_observed_data
+            satellite_elements: Satellite arrays from build_satellite_elements
             frame_type: Reference frame type (1=FRAME_EARTH, 2=FRAME_UT)
             df_gps_diagnostics: Optional DataFrame with GPS data for mobile installations
 
@@ -343,53 +686,105 @@ class SatelliteProcessor:
 
         Note:
             - Processes data in 15-second intervals
+            - Intervals without observed positions are skipped before any work is scheduled
             - Returns None if no data points are processed
         """
         try:
-            # Create datetime objects for start and end times
-            start_time = datetime(
-                start_year, start_month, start_day, start_hour, start_minute, start_second, tzinfo=timezone.utc
+            # Precompute the start time of every interval once
+            interval_count = int((end_time - start_time).total_seconds() // TimeslotManager.TIMESLOT_PERIOD) + 1
+            interval_starts = [
+                start_time + timedelta(seconds=TimeslotManager.TIMESLOT_PERIOD * i)
+                for i in range(max(interval_count, 0))
+            ]
+
+            # Only the intervals with observed positions can be matched, their bounds are found by binary
+            # search on the sorted timestamp index like in DataFeatureExtraction.process_observed_data
+            interval_bounds = pd.DatetimeIndex(interval_starts).floor("s")
+            if interval_bounds.tz is not None:
+                interval_bounds = interval_bounds.tz_convert("UTC").tz_localize(None)
+            first_observed = df_observed.index.searchsorted(interval_bounds)
+            end_observed = df_observed.index.searchsorted(
+                interval_bounds + pd.Timedelta(seconds=TimeslotManager.TIMESLOT_PERIOD)
             )
-            end_time = datetime(end_year, end_month, end_day, end_hour, end_minute, end_second, tzinfo=timezone.utc)
-
-            results = []
-            current_time = start_time
-
-            while current_time <= end_time:
-                logger.info(f"Estimating connected satellites for timeslot {current_time}")
-
-                _, matching_satellites, distances = self.process_feature_time_interval(
-                    filename,
-                    current_time.year,
-                    current_time.month,
-                    current_time.day,
-                    current_time.hour,
-                    current_time.minute,
-                    current_time.second,
-                    merged_data_file,
-                    satellites,
-                    frame_type,
-                    df_gps_diagnostics,
+            active_intervals = np.flatnonzero(end_observed > first_observed)
+            if len(active_intervals) < len(interval_starts):
+                logger.info(
+                    f"Skipping {len(interval_starts) - len(active_intervals)} of {len(interval_starts)} "
+                    f"intervals without observed positions"
                 )
 
-                if matching_satellites and distances:
-                    for second in range(15):
-                        if second < len(distances):
-                            results.append(
-                                {
-                                    "Timestamp": current_time + timedelta(seconds=second),
-                                    "Connected_Satellite": matching_satellites[0],
-                                    "Distance": distances[second],
-                                }
-                            )
+            # The observer location is the same for every interval, and so is the frame of a fixed observer
+            observer_location = self.location_provider.get_observer_location(df_gps_diagnostics)
+            observer_frame = None
+            if not config.MOBILE and observer_location is not None:
+                observer_frame = self.get_observer_frame([observer_location])
+
+            interval_arguments = {
+                "df_observed": df_observed,
+                "satellite_elements": satellite_elements,
+                "frame_type": frame_type,
+                "df_gps_diagnostics": df_gps_diagnostics,
+                # GPS data prepared once for the location lookups of every interval of a mobile installation
+                "df_gps_track": self.location_provider.prepare_gps_track(df_gps_diagnostics) if config.MOBILE else None,
+                "observer_frame": observer_frame,
+                "observer_location": observer_location,
+                # Propagation times for every second of every interval, shared by all of them
+                "time_grid": self.build_time_grid(start_time, TimeslotManager.TIMESLOT_PERIOD * len(interval_starts)),
+            }
+
+            # For a fixed observer, a coarse prefilter shared by the intervals of each window drops the
+            # satellites that cannot be visible before the per-interval prefilter
+            interval_satellite_indices = [None] * len(interval_starts)
+            if observer_frame is not None and interval_starts:
+                intervals_per_window = self.COARSE_PREFILTER_SECONDS // TimeslotManager.TIMESLOT_PERIOD
+                coarse_candidates = self.build_coarse_candidates(
+                    satellite_elements,
+                    start_time,
+                    (len(interval_starts) - 1) // intervals_per_window + 1,
+                    observer_frame,
+                    interval_arguments["time_grid"],
+                )
+                interval_satellite_indices = [
+                    coarse_candidates[i // intervals_per_window] for i in range(len(interval_starts))
+                ]
 
-                current_time += timedelta(seconds=15)
+            active_starts = [interval_starts[i] for i in active_intervals]
+            active_satellite_indices = [interval_satellite_indices[i] for i in active_intervals]
 
-            if not results:
+            interval_results = [
+                self.process_feature_time_interval(
+                    initial_time=current_time, satellite_indices=satellite_indices, **interval_arguments
+                )
+                for current_time, satellite_indices in zip(active_starts, active_satellite_indices)
+            ]
+
+            # Preallocate the result columns for every second of every processed interval
+            max_rows = TimeslotManager.TIMESLOT_PERIOD * len(active_starts)
+            offsets = np.empty(max_rows, dtype=np.int64)
+            connected_satellites = np.empty(max_rows, dtype=object)
+            distances_km = np.empty(max_rows, dtype=np.float64)
+            row_count = 0
+
+            for i, (_, matching_satellites, distances) in zip(active_intervals, interval_results):
+                if matching_satellites and distances is not None:
+                    n = min(TimeslotManager.TIMESLOT_PERIOD, len(distances))
+                    rows = slice(row_count, row_count + n)
+                    offsets[rows] = TimeslotManager.TIMESLOT_PERIOD * i + np.arange(n)
+                    connected_satellites[rows] = matching_satellites[0]
+                    distances_km[rows] = distances[:n]
+                    row_count += n
+
+            if row_count == 0:
                 logger.warning("No data points processed")
                 return None
 
-            return pd.DataFrame(results)
+            return pd.DataFrame(
+                {
+                    "Timestamp": pd.Timestamp(start_time) + pd.to_timedelta(offsets[:row_count], unit="s"),
+                    "Connected_Satellite": connected_satellites[:row_count],
+                    "Distance": distances_km[:row_count],
+                }
+            )
 
         except Exception as e:
             logger.error(f"Error processing intervals: {str(e)}", exc_info=True)
@@ -399,51 +794,49 @@ class SatelliteProcessor:
         """Calculate the total angular separation and bearing difference.
 
         Args:
-            observed_positions: List of (altitude, azimuth) tuples for observed positions
-            satellite_positions: List of (altitude, azimuth) tuples for satellite positions
+            observed_positions: Array of shape (N, 2) with (altitude, azimuth) of observed positions
+            satellite_positions: Array of shape (N, 2) with (altitude, azimuth) of satellite positions, or of
+                shape (satellites, N, 2) to score several satellites at once
 
         Returns:
-            float: Combined measure of angular separation and bearing difference
+            float: Combined measure of angular separation and bearing difference, an array with one value
+                per satellite for several satellites
         """
-        total_angular_separation = 0
-        for i in range(len(observed_positions)):
-            obs_alt, obs_az = observed_positions[i]
-            sat_alt, sat_az = satellite_positions[i]
-            separation = self.angular_separation(obs_alt, obs_az, sat_alt, sat_az)
-            total_angular_separation += separation
+        observed_positions = np.asarray(observed_positions, dtype=np.float64)
+        satellite_positions = np.asarray(satellite_positions, dtype=np.float64)
+        separation = self.angular_separation(
+            observed_positions[..., 0],
+            observed_positions[..., 1],
+            satellite_positions[..., 0],
+            satellite_positions[..., 1],
+        )
         bearing_diff = self.calculate_bearing_difference(observed_positions, satellite_positions)
-        total_difference = total_angular_separation + bearing_diff
-        return total_difference
+        return separation.sum(axis=-1) + bearing_diff
 
     def angular_separation(self, alt1, az1, alt2, az2):
         """Calculate the angular separation between two points on a sphere.
 
         Args:
-            alt1, az1: Altitude and azimuth of first point in degrees
-            alt2, az2: Altitude and azimuth of second point in degrees
+            alt1, az1: Altitude and azimuth of first point in degrees, scalars or arrays
+            alt2, az2: Altitude and azimuth of second point in degrees, scalars or arrays
 
         Returns:
-            float: Angular separation in degrees
+            float: Angular separation in degrees, element-wise for arrays
         """
         alt1, alt2 = np.radians(alt1), np.radians(alt2)
-        az1 = (az1 + 360) % 360
-        az2 = (az2 + 360) % 360
-        az_diff = np.abs(az1 - az2)
-        if az_diff > 180:
-            az_diff = 360 - az_diff
-        az_diff = np.radians(az_diff)
-        separation = np.arccos(np.sin(alt1) * np.sin(alt2) + np.cos(alt1) * np.cos(alt2) * np.cos(az_diff))
-        return np.degrees(separation)
+        az_diff = np.radians(self.azimuth_difference(az1, az2))
+        cos_separation = np.sin(alt1) * np.sin(alt2) + np.cos(alt1) * np.cos(alt2) * np.cos(az_diff)
+        return np.degrees(np.arccos(np.clip(cos_separation, -1.0, 1.0)))
 
     def calculate_bearing(self, alt1, az1, alt2, az2):
         """Calculate bearing between two points.
 
         Args:
-            alt1, az1: Altitude and azimuth of first point in degrees
-            alt2, az2: Altitude and azimuth of second point in degrees
+            alt1, az1: Altitude and azimuth of first point in degrees, scalars or arrays
+            alt2, az2: Altitude and azimuth of second point in degrees, scalars or arrays
 
         Returns:
-            float: Bearing in degrees (0-360)
+            float: Bearing in degrees (0-360), element-wise for arrays
         """
         alt1, alt2 = np.radians(alt1), np.radians(alt2)
         az1, az2 = np.radians(az1), np.radians(az2)
@@ -457,38 +850,41 @@ class SatelliteProcessor:
         """Calculate bearing difference between two trajectories.
 
         Args:
-            observed_trajectory: List of (altitude, azimuth) tuples for observed positions
-            satellite_trajectory: List of (altitude, azimuth) tuples for satellite positions
+            observed_trajectory: Array of shape (N, 2) with (altitude, azimuth) of observed positions
+            satellite_trajectory: Array of shape (N, 2) with (altitude, azimuth) of satellite positions, or of
+                shape (satellites, N, 2)
 
         Returns:
-            float: Bearing difference in degrees (0-180)
+            float: Bearing difference in degrees (0-180), one per satellite for several satellites
         """
+        observed_trajectory = np.asarray(observed_trajectory, dtype=np.float64)
+        satellite_trajectory = np.asarray(satellite_trajectory, dtype=np.float64)
         observed_bearing = self.calculate_bearing(
-            observed_trajectory[0][0],
-            observed_trajectory[0][1],
-            observed_trajectory[-1][0],
-            observed_trajectory[-1][1],
+            observed_trajectory[..., 0, 0],
+            observed_trajectory[..., 0, 1],
+            observed_trajectory[..., -1, 0],
+            observed_trajectory[..., -1, 1],
         )
         satellite_bearing = self.calculate_bearing(
-            satellite_trajectory[0][0],
-            satellite_trajectory[0][1],
-            satellite_trajectory[-1][0],
-            satellite_trajectory[-1][1],
+            satellite_trajectory[..., 0, 0],
+            satellite_trajectory[..., 0, 1],
+            satellite_trajectory[..., -1, 0],
+            satellite_trajectory[..., -1, 1],
         )
-        bearing_diff = abs(observed_bearing - satellite_bearing)
-        if bearing_diff > 180:
-            bearing_diff = 360 - bearing_diff
-        return bearing_diff
+        bearing_diff = np.abs(observed_bearing - satellite_bearing)
+        return np.minimum(bearing_diff, 360 - bearing_diff)
 
     def calculate_trajectory_distance_frame_ut(self, observed_positions, satellite_positions):
         """Calculate the distance measure between observed and satellite trajectories.
 
         Args:
-            observed_positions: List of (altitude, azimuth) tuples for observed positions
-            satellite_positions: List of (altitude, azimuth) tuples for satellite positions
+            observed_positions: Array of shape (N, 2) with (altitude, azimuth) of observed positions
+            satellite_positions: Array of shape (N, 2) with (altitude, azimuth) of satellite positions, or of
+                shape (satellites, N, 2) to score several satellites at once
 
         Returns:
-            float: Combined measure of position and direction differences
+            float: Combined measure of position and direction differences, an array with one value per
+                satellite for several satellites
 
         Note:
             Uses normalized differences in altitude, azimuth, and direction
@@ -497,16 +893,19 @@ class SatelliteProcessor:
         azimuth_range = 180.0  # Maximum possible azimuth difference
         direction_range = 2.0  # Maximum possible direction difference
 
-        distance = 0
-        for i in range(len(observed_positions)):
-            # Calculate distance between points
-            alt_deviation = abs(observed_positions[i][0] - satellite_positions[i][0]) / altitude_range
-            az_deviation = self.azimuth_difference(observed_positions[i][1], satellite_positions[i][1]) / azimuth_range
-            distance += alt_deviation + az_deviation
+        observed_positions = np.asarray(observed_positions, dtype=np.float64)
+        satellite_positions = np.asarray(satellite_positions, dtype=np.float64)
+
+        # Calculate distance between points
+        alt_deviation = np.abs(observed_positions[..., 0] - satellite_positions[..., 0]) / altitude_range
+        az_deviation = self.azimuth_difference(observed_positions[..., 1], satellite_positions[..., 1]) / azimuth_range
+        distance = (alt_deviation + az_deviation).sum(axis=-1)
 
         # Calculate the overall direction vectors
-        obs_dir_vector = self.calculate_direction_vector(observed_positions[0], observed_positions[-1])
-        sat_dir_vector = self.calculate_direction_vector(satellite_positions[0], satellite_positions[-1])
+        obs_dir_vector = self.calculate_direction_vector(observed_positions[..., 0, :], observed_positions[..., -1, :])
+        sat_dir_vector = self.calculate_direction_vector(
+            satellite_positions[..., 0, :], satellite_positions[..., -1, :]
+        )
 
         # Calculate direction difference
         direction_diff = (
@@ -515,35 +914,35 @@ class SatelliteProcessor:
         )
 
         # Add the direction difference to the distance measure
-        total_distance = distance + direction_diff
-
-        return total_distance
+        return distance + direction_diff
 
     def azimuth_difference(self, az1, az2):
         """Calculate the smallest difference between two azimuth angles.
 
         Args:
-            az1, az2: Two azimuth angles in degrees
+            az1, az2: Two azimuth angles in degrees, scalars or arrays
 
         Returns:
-            float: Smallest difference between angles (0-180 degrees)
+            float: Smallest difference between angles (0-180 degrees), element-wise for arrays
         """
-        diff = abs(az1 - az2) % 360
-        if diff > 180:
-            diff = 360 - diff
-        return diff
+        diff = np.abs(az1 - az2) % 360.0
+        return np.minimum(diff, 360.0 - diff)
 
     def calculate_direction_vector(self, point1, point2):
         """Calculate the direction vector from point1 to point2.
 
         Args:
-            point1: (altitude, azimuth) tuple for first point
-            point2: (altitude, azimuth) tuple for second point
+            point1: (altitude, azimuth) of first point, or an array of shape (..., 2) of them
+            point2: (altitude, azimuth) of second point, or an array of shape (..., 2) of them
 
         Returns:
-            Tuple[float, float]: Normalized direction vector (alt_diff, az_diff)
+            Tuple[float, float]: Normalized direction vector (alt_diff, az_diff), (0, 0) for identical points
         """
-        alt_diff = point2[0] - point1[0]
-        az_diff = self.azimuth_difference(point2[1], point1[1])
+        point1 = np.asarray(point1, dtype=np.float64)
+        point2 = np.asarray(point2, dtype=np.float64)
+        alt_diff = point2[..., 0] - point1[..., 0]
+        az_diff = self.azimuth_difference(point2[..., 1], point1[..., 1])
         magnitude = np.sqrt(alt_diff**2 + az_diff**2)
-        return (alt_diff / magnitude, az_diff / magnitude) if magnitude != 0 else (0, 0)
+        nonzero = magnitude != 0
+        safe_magnitude = np.where(nonzero, magnitude, 1.0)
+        return np.where(nonzero, alt_diff / safe_magnitude, 0.0), np.where(nonzero, az_diff / safe_magnitude, 0.0)
@@ -64,27 +64,53 @@ class TimeslotManager:
 
     TIMESLOT_DURATION = 14
     TIMESLOT_INTERVALS = [(12, 27), (27, 42), (42, 57), (57, 12)]
+    TIMESLOT_PERIOD = 15  # Seconds between the starts of two timeslots
+    TIMESLOT_OFFSET = 12  # Second of the minute at which the first timeslot starts
+
+    @staticmethod
+    def get_next_timeslot_start(now: datetime) -> datetime:
+        """Get the start of the first timeslot after the given time.
+
+        Args:
+            now: The time to get the next timeslot start for
+
+        Returns:
+            datetime: Start of the next timeslot, at one of the TIMESLOT_INTERVALS start seconds
+
+        Note:
+            - A time exactly at a timeslot start returns the start of the following timeslot
+        """
+        offset = (now.second - TimeslotManager.TIMESLOT_OFFSET) % TimeslotManager.TIMESLOT_PERIOD
+        return now.replace(microsecond=0) + timedelta(seconds=TimeslotManager.TIMESLOT_PERIOD - offset)
+
+    @staticmethod
+    def sleep_until(target_time: datetime) -> None:
+        """Sleep until the given time.
+
+        Args:
+            target_time: Timezone-aware time to wake up at
+
+        Note:
+            - Sleeps for the whole remaining time at once, and again for whatever is left if
+              the sleep returns early
+        """
+        deadline = target_time.timestamp()
+        remaining = deadline - time.time()
+        while remaining > 0:
+            time.sleep(remaining)
+            remaining = deadline - time.time()
 
     @staticmethod
     def wait_until_target_time(last_timeslot_second: int) -> int:
         """Wait until the next timeslot and return the next timeslot second."""
         now = datetime.now(timezone.utc)
-        next_timeslot_second = None
-
-        if last_timeslot_second == 12:
-            next_timeslot_second = 27
-        elif last_timeslot_second == 27:
-            next_timeslot_second = 42
-        elif last_timeslot_second == 42:
-            next_timeslot_second = 57
-        elif last_timeslot_second == 57:
-            next_timeslot_second = 12
-            # If we're moving to the next minute
-            if now.second >= 57:
-                now = now + timedelta(minutes=1)
+        next_timeslot_second = (last_timeslot_second + TimeslotManager.TIMESLOT_PERIOD) % 60
+
+        # If we're moving to the next minute
+        if next_timeslot_second < last_timeslot_second and now.second >= last_timeslot_second:
+            now = now + timedelta(minutes=1)
 
         target_time = now.replace(microsecond=0).replace(second=next_timeslot_second)
-        while datetime.now(timezone.utc) < target_time:
-            time.sleep(0.1)
+        TimeslotManager.sleep_until(target_time)
 
         return next_timeslot_second
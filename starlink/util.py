@@ -4,7 +4,7 @@ import time
 import logging
 
 from typing import Optional, Tuple
-from shutil import which
+from shutil import copy2, which
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -13,21 +13,28 @@ import multiprocessing
 
 from skyfield.api import load
 
-from config import DATA_DIR, TLE_DATA_DIR, TLE_URL
+from config import DATA_DIR, TLE_DATA_DIR, TLE_URL, TLE_MAX_AGE_SECONDS
 
 logging.basicConfig(level=logging.INFO, format="[%(asctime)s] [%(levelname)s] %(message)s")
 
 
 logger = logging.getLogger(__name__)
 
+_TIMESTAMP_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})-(\d{2})-(\d{2})-(\d{2})")
+_UUID_RE = re.compile(r"([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12})")
+_PING_RE = re.compile(r"\[(\d+\.\d+)\].*icmp_seq=(\d+).*time=(\d+(\.\d+)?)")
+
 
 def get_latest_file(directory: str, pattern: str) -> Optional[str]:
     """Get the latest file matching the pattern in the directory."""
     try:
-        files = [f for f in os.listdir(directory) if re.match(pattern, f)]
+        matcher = re.compile(pattern).match
+        # The stat results of the directory entries are reused instead of a stat call per path
+        with os.scandir(directory) as entries:
+            files = [(entry.stat().st_ctime, entry.name) for entry in entries if matcher(entry.name)]
         if not files:
             return None
-        return max(files, key=lambda x: os.path.getctime(os.path.join(directory, x)))
+        return max(files, key=lambda file: file[0])[1]
     except Exception as e:
         logger.error(f"Error getting latest file: {str(e)}", exc_info=True)
         return None
@@ -36,9 +43,10 @@ def get_latest_file(directory: str, pattern: str) -> Optional[str]:
 def parse_timestamp_from_filename(filename: str) -> Optional[datetime]:
     """Parse timestamp from filename."""
     try:
-        match = re.search(r"(\d{4}-\d{2}-\d{2}-\d{2}-\d{2}-\d{2})", filename)
+        match = _TIMESTAMP_RE.search(filename)
         if match:
-            return datetime.strptime(match.group(1), "%Y-%m-%d-%H-%M-%S")
+            # The fields are fixed-width digits, so they are converted directly instead of with strptime
+            return datetime(*map(int, match.groups()))
         return None
     except Exception as e:
         logger.error(f"Error parsing timestamp from filename: {str(e)}", exc_info=True)
@@ -68,7 +76,7 @@ def get_file_info(filepath: str) -> Tuple[Optional[datetime], Optional[str]]:
     try:
         filename = os.path.basename(filepath)
         timestamp = parse_timestamp_from_filename(filename)
-        uuid_match = re.search(r"([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12})", filename)
+        uuid_match = _UUID_RE.search(filename)
         uuid = uuid_match.group(1) if uuid_match else None
         return timestamp, uuid
     except Exception as e:
@@ -78,21 +86,13 @@ def get_file_info(filepath: str) -> Tuple[Optional[datetime], Optional[str]]:
 
 def load_ping(filename):
     with open(filename, "r") as f:
-        rtt_list = []
-        timestamp_list = []
-        for line in f.readlines():
-            match = re.search(r"\[(\d+\.\d+)\].*icmp_seq=(\d+).*time=(\d+(\.\d+)?)", line)
-            if match:
-                # timestamp = datetime.fromtimestamp(float(match.group(1)), tz=pytz.utc)
-                timestamp = float(match.group(1))
-                rtt = float(match.group(3))
-                timestamp_list.append(timestamp)
-                rtt_list.append(rtt)
+        # Ping replies never span lines, so a single scan of the whole file finds one match per reply
+        matches = _PING_RE.findall(f.read())
 
     return pd.DataFrame(
         {
-            "timestamp": timestamp_list,
-            "rtt": rtt_list,
+            "timestamp": [float(match[0]) for match in matches],
+            "rtt": [float(match[2]) for match in matches],
         }
     )
 
@@ -134,5 +134,14 @@ def run(func):
 def load_tle():
     global satellites
     directory = Path(TLE_DATA_DIR).joinpath(ensure_data_directory(str(TLE_DATA_DIR)))
-    satellites = load.tle_file(TLE_URL, True, "{}/starlink-tle-{}.txt".format(directory, date_time_string()))
+    filename = directory.joinpath("starlink-tle-{}.txt".format(date_time_string()))
+
+    # Reuse the latest TLE file of the day while it is fresh. It is copied with its modification time, so
+    # that its age keeps counting from the download, and every run still has a TLE file under its own name
+    latest = get_latest_file(str(directory), r"starlink-tle-.*\.txt$")
+    if latest is not None and time.time() - directory.joinpath(latest).stat().st_mtime < TLE_MAX_AGE_SECONDS:
+        copy2(directory.joinpath(latest), filename)
+        satellites = load.tle_file(str(filename))
+    else:
+        satellites = load.tle_file(TLE_URL, True, str(filename))
     print("Loaded {} Starlink satellites from TLE data".format(len(satellites)))